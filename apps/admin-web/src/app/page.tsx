@@ -80,9 +80,27 @@ interface AnalyticsData {
   this_week_count: number;
 }
 
+interface DailyPriorityVolume {
+  date: string;
+  high: number;
+  medium: number;
+  low: number;
+}
+
+interface ActionAnalyticsData {
+  start_date: string;
+  end_date: string;
+  total_actions: number;
+  by_owner: Array<{ owner: string; count: number }>;
+  by_priority: Array<{ priority: string; count: number }>;
+  daily_priority: DailyPriorityVolume[];
+}
+
 export default function Home() {
   const [submissions, setSubmissions] = useState<Submission[]>([]);
   const [analytics, setAnalytics] = useState<AnalyticsData | null>(null);
+  const [actionAnalytics, setActionAnalytics] =
+    useState<ActionAnalyticsData | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [lastUpdated, setLastUpdated] = useState<Date | null>(null);
@@ -127,18 +145,35 @@ export default function Home() {
     }
   }, [apiUrl]);
 
+  const fetchActionAnalytics = useCallback(async () => {
+    try {
+      const response = await fetch(`${apiUrl}/v1/analytics/actions`);
+
+      if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+      }
+
+      const data: ActionAnalyticsData = await response.json();
+      setActionAnalytics(data);
+    } catch (err) {
+      console.error("Failed to fetch action analytics:", err);
+    }
+  }, [apiUrl]);
+
   useEffect(() => {
     fetchSubmissions();
     fetchAnalytics();
+    fetchActionAnalytics();
 
     // Auto-refresh every 10 seconds
     const interval = setInterval(() => {
       fetchSubmissions();
       fetchAnalytics();
+      fetchActionAnalytics();
     }, 10000);
 
     return () => clearInterval(interval);
-  }, [fetchSubmissions, fetchAnalytics]);
+  }, [fetchSubmissions, fetchAnalytics, fetchActionAnalytics]);
 
   const formatDate = (dateString: string) => {
     const date = new Date(dateString);
@@ -180,29 +215,7 @@ export default function Home() {
   };
 
   const getPriorityDistributionData = () => {
-    if (!analytics?.daily_volume) return [];
-    return analytics.daily_volume.map((day) => {
-      const daySubmissions = submissions.filter((s) => {
-        const submissionDate = new Date(s.created_at)
-          .toISOString()
-          .split("T")[0];
-        return submissionDate === day.date;
-      });
-
-      let high = 0,
-        medium = 0,
-        low = 0;
-      daySubmissions.forEach((sub) => {
-        sub.admin_recommended_actions?.forEach((action) => {
-          const priority = action.priority.toLowerCase();
-          if (priority === "high") high++;
-          else if (priority === "medium") medium++;
-          else if (priority === "low") low++;
-        });
-      });
-
-      return { date: day.date, high, medium, low };
-    });
+    return actionAnalytics?.daily_priority ?? [];
   };
 
   const getRatingDistributionData = () => {
@@ -215,17 +228,10 @@ export default function Home() {
   };
 
   const getTeamDistributionData = () => {
-    const teamCounts: Record<string, number> = {};
-
-    submissions.forEach((sub) => {
-      sub.admin_recommended_actions?.forEach((action) => {
-        const team = action.owner;
-        teamCounts[team] = (teamCounts[team] || 0) + 1;
-      });
-    });
-
-    return Object.entries(teamCounts)
-      .map(([team, actions]) => ({ team, actions }))
+    if (!actionAnalytics?.by_owner) return [];
+    return actionAnalytics.by_owner
+      .filter((item) => item.count > 0)
+      .map((item) => ({ team: item.owner, actions: item.count }))
       .sort((a, b) => b.actions - a.actions);
   };
 
@@ -0,0 +1,104 @@
+"""
+Normalized storage of recommended actions for analytics.
+
+Each entry of `Submission.admin_recommended_actions` is mirrored into the
+`submission_actions` table so owner/priority counts can be aggregated with
+plain GROUP BY queries instead of parsing JSON per row.
+
+Run `python actions.py backfill` to populate rows for existing submissions.
+"""
+import sys
+import argparse
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy.orm import Session
+
+from models import Submission, SubmissionAction
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def build_submission_actions(
+    submission_id, created_at: datetime, actions: Optional[List[Dict[str, Any]]]
+) -> List[SubmissionAction]:
+    """Build action rows from a submission's admin_recommended_actions JSON."""
+    rows = []
+    for action in actions or []:
+        if not isinstance(action, dict):
+            continue
+        if not action.get("action") or not action.get("priority") or not action.get("owner"):
+            continue
+        rows.append(SubmissionAction(
+            submission_id=submission_id,
+            created_at=created_at,
+            action=str(action["action"]),
+            priority=str(action["priority"]).lower(),
+            owner=str(action["owner"]).lower(),
+        ))
+    return rows
+
+
+def backfill_submission_actions(db: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Create action rows for submissions that don't have any yet.
+    Walks the submissions table in id order, committing once per batch.
+    Returns: number of action rows created
+    """
+    created = 0
+    last_id = None
+
+    while True:
+        q = db.query(Submission).filter(Submission.admin_recommended_actions.isnot(None))
+        if last_id is not None:
+            q = q.filter(Submission.id > last_id)
+        batch = q.order_by(Submission.id).limit(batch_size).all()
+        if not batch:
+            break
+
+        ids = [s.id for s in batch]
+        already_indexed = {
+            submission_id
+            for (submission_id,) in (
+                db.query(SubmissionAction.submission_id)
+                .filter(SubmissionAction.submission_id.in_(ids))
+                .distinct()
+            )
+        }
+
+        for s in batch:
+            if s.id in already_indexed:
+                continue
+            rows = build_submission_actions(s.id, s.created_at, s.admin_recommended_actions)
+            db.add_all(rows)
+            created += len(rows)
+
+        db.commit()
+        last_id = ids[-1]
+        db.expunge_all()
+
+    return created
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage normalized submission actions.")
+    parser.add_argument("command", choices=["backfill"], help="populate rows for existing submissions")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    from database import engine, SessionLocal, Base
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print("Backfilling submission actions...")
+        created = backfill_submission_actions(db, batch_size=args.batch_size)
+        print(f"Created {created} action rows.")
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
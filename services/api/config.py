@@ -0,0 +1,53 @@
+"""
+Application configuration.
+The .env file is loaded once here; other modules read their settings from this module.
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Database
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Optional read replicas, comma-separated. Reads that tolerate staleness go here.
+DATABASE_READ_URLS = [url.strip() for url in os.getenv("DATABASE_READ_URL", "").split(",") if url.strip()]
+
+# Replicas lagging more than this are skipped in favour of the primary
+DATABASE_READ_MAX_LAG_SECONDS = float(os.getenv("DATABASE_READ_MAX_LAG_SECONDS", "5"))
+DATABASE_READ_LAG_CHECK_INTERVAL = float(os.getenv("DATABASE_READ_LAG_CHECK_INTERVAL", "5"))
+DATABASE_READ_CONNECT_TIMEOUT = int(os.getenv("DATABASE_READ_CONNECT_TIMEOUT", "2"))
+
+# Export watermarks stay this far behind the clock. created_at is set before
+# commit (and replicas replay with a delay), so newer rows can still appear
+# below the newest created_at; keep this above the longest transaction plus
+# DATABASE_READ_MAX_LAG_SECONDS.
+EXPORT_WATERMARK_GRACE_SECONDS = float(os.getenv("EXPORT_WATERMARK_GRACE_SECONDS", "30"))
+
+# Connection pool (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# Run schema creation in the app's startup hook. Deployments that run
+# `python init_db.py` as a separate migration step should set this to false.
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "true").lower() == "true"
+
+# LLM
+LLM_API_KEY = os.getenv("LLM_API_KEY")
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai").lower()
+LLM_MODEL = os.getenv("LLM_MODEL")
+
+# Local classifier (optional, needs requirements-ml.txt): answers confident
+# predictions from templates instead of calling the LLM
+LOCAL_CLASSIFIER_ENABLED = os.getenv("LOCAL_CLASSIFIER_ENABLED", "false").lower() == "true"
+LOCAL_CLASSIFIER_PATH = os.getenv("LOCAL_CLASSIFIER_PATH", "./artifacts/review_classifier.joblib")
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.9"))
+
+# Retention
+RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "90"))
+# No default: archives must go to persistent storage that every API instance
+# can read, so retention.py refuses to run until this is set explicitly
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR")
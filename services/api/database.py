@@ -1,32 +1,152 @@
-import os
-from sqlalchemy import create_engine
+import time
+import threading
+from typing import Optional, List
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-
-load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+from config import (
+    DATABASE_URL,
+    DATABASE_READ_URLS,
+    DATABASE_READ_MAX_LAG_SECONDS,
+    DATABASE_READ_LAG_CHECK_INTERVAL,
+    DATABASE_READ_CONNECT_TIMEOUT,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT,
+    DB_POOL_RECYCLE,
+    DB_POOL_PRE_PING,
+)
 
 # Default to SQLite for local development if no DATABASE_URL is set
 if DATABASE_URL is None:
     DATABASE_URL = "sqlite:///./fynd_reviews.db"
     print("Warning: DATABASE_URL not set, using SQLite for local development")
 
-# Handle Render's postgres:// vs postgresql:// URL scheme
-if DATABASE_URL.startswith("postgres://"):
-    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-# SQLite requires different configuration
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
-else:
-    engine = create_engine(DATABASE_URL)
+def _create_engine(url: str, connect_args: Optional[dict] = None) -> Engine:
+    # Handle Render's postgres:// vs postgresql:// URL scheme
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+
+    # SQLite requires different configuration
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(url, connect_args={"check_same_thread": False})
+
+        # WAL lets long reads (e.g. a streaming export) run alongside writes;
+        # the default rollback journal holds a shared lock that blocks them
+        @event.listens_for(sqlite_engine, "connect")
+        def _enable_wal(dbapi_connection, connection_record):
+            dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+        return sqlite_engine
+
+    return create_engine(
+        url,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        connect_args=connect_args or {},
+    )
+
+
+engine = _create_engine(DATABASE_URL)
+# Replicas get a short connect timeout: an unreachable one must fail fast
+# instead of hanging the read that happens to check its lag
+read_engines = [
+    _create_engine(url, connect_args={"connect_timeout": DATABASE_READ_CONNECT_TIMEOUT})
+    for url in DATABASE_READ_URLS
+]
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+# Replay lag in seconds; 0 when the replica has applied everything it received.
+# A replica that isn't streaming from the primary counts as infinitely behind:
+# once its WAL receiver disconnects, received == replayed and it would look
+# current forever. Reading pg_stat_wal_receiver.status needs pg_read_all_stats
+# (e.g. via pg_monitor); without it every replica is skipped.
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')
+            THEN 'Infinity'::float8
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())::float8, 0)
+    END
+""")
+
+
+class ReplicaRouter:
+    """
+    Round-robin over read replicas, skipping any whose replication lag exceeds
+    `max_lag_seconds` (bounded staleness). Lag is re-checked at most once per
+    `check_interval` per replica. Falls back to the primary when no replica
+    qualifies.
+    """
+
+    def __init__(self, primary: Engine, replicas: List[Engine], max_lag_seconds: float, check_interval: float):
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._next = 0
+        self._lag = {}  # replica index -> (checked_at, lag_seconds)
+        self._lock = threading.Lock()
+
+    def _replica_lag(self, index: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            checked_at, lag = self._lag.get(index, (None, float("inf")))
+            if checked_at is not None and now - checked_at < self.check_interval:
+                return lag
+            # Claim the check so only this request probes; the others keep the
+            # last known lag (a never-checked replica is skipped) meanwhile
+            self._lag[index] = (now, lag)
+
+        try:
+            with self.replicas[index].connect() as conn:
+                lag = float(conn.execute(REPLICA_LAG_QUERY).scalar() or 0.0)
+        except Exception:
+            lag = float("inf")  # Unreachable replicas are skipped until the next check
+
+        with self._lock:
+            self._lag[index] = (time.monotonic(), lag)
+        return lag
+
+    def choose(self) -> Engine:
+        """Pick an engine for a read that tolerates bounded staleness."""
+        if not self.replicas:
+            return self.primary
+
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % len(self.replicas)
+
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._replica_lag(index) <= self.max_lag_seconds:
+                return self.replicas[index]
+        return self.primary
+
+
+replica_router = ReplicaRouter(
+    engine,
+    read_engines,
+    max_lag_seconds=DATABASE_READ_MAX_LAG_SECONDS,
+    check_interval=DATABASE_READ_LAG_CHECK_INTERVAL,
+)
+
+
+def ReadSessionLocal(consistency: Optional[str] = None):
+    """Session for reads: a replica within the staleness bound, or the primary for strong consistency."""
+    bind = engine if consistency == "strong" else replica_router.choose()
+    return SessionLocal(bind=bind)
+
 
 def get_db():
     """Dependency for getting database session."""
@@ -0,0 +1,305 @@
+"""
+Streaming bulk export of submissions to CSV, NDJSON and Parquet.
+
+Rows are read through a server-side cursor (`stream_results` + `yield_per`)
+and encoded chunk by chunk, so memory use stays constant regardless of how
+many rows are exported. Exports are bounded by a watermark (the newest
+`created_at` older than EXPORT_WATERMARK_GRACE_SECONDS when the export
+starts); pass it back as `since` to export only rows added afterwards.
+
+Parquet needs pyarrow (see requirements-export.txt); CSV and NDJSON don't.
+
+Usage:
+    python export.py --format parquet --output submissions.parquet
+    python export.py --format ndjson --output new.ndjson --state-file .export_watermark
+"""
+import io
+import os
+import sys
+import csv
+import json
+import argparse
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Iterator
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from config import EXPORT_WATERMARK_GRACE_SECONDS
+from models import Submission
+from filters import apply_submission_filters
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_COLUMNS = [
+    "id",
+    "created_at",
+    "rating",
+    "review_text",
+    "user_response",
+    "admin_summary",
+    "admin_recommended_actions",
+    "llm_model",
+    "prompt_version",
+    "llm_latency_ms",
+    "llm_error",
+]
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def check_format(fmt: str) -> None:
+    """Raise ValueError if the format is unknown or its dependencies are missing."""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}', expected one of: {', '.join(EXPORT_FORMATS)}")
+    if fmt == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export requires the 'pyarrow' package (requirements-export.txt)")
+
+
+def get_watermark(
+    db: Session,
+    since: Optional[datetime] = None,
+    grace_seconds: float = EXPORT_WATERMARK_GRACE_SECONDS,
+) -> Optional[datetime]:
+    """
+    Newest created_at at least `grace_seconds` old (or `since` if nothing is newer).
+    created_at is set at flush time, before commit, so rows can become visible
+    out of created_at order; stopping short of the last few seconds keeps a
+    later commit from landing below a watermark that was already handed out.
+    """
+    q = db.query(func.max(Submission.created_at)).filter(
+        Submission.created_at <= datetime.utcnow() - timedelta(seconds=grace_seconds)
+    )
+    if since is not None:
+        q = q.filter(Submission.created_at > since)
+    newest = q.scalar()
+    return newest if newest is not None else since
+
+
+def iter_submission_chunks(
+    db: Session,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    since: Optional[datetime] = None,
+    watermark: Optional[datetime] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield lists of submission rows (as dicts) in created_at order.
+    `since` is exclusive, `watermark` is inclusive.
+    """
+    table = Submission.__table__
+    stmt = select(*[table.c[name] for name in EXPORT_COLUMNS])
+    stmt = apply_submission_filters(stmt, min_rating, max_rating, start_date, end_date)
+    if since is not None:
+        stmt = stmt.filter(Submission.created_at > since)
+    if watermark is not None:
+        stmt = stmt.filter(Submission.created_at <= watermark)
+    stmt = (
+        stmt.order_by(Submission.created_at, Submission.id)
+        .execution_options(stream_results=True, yield_per=chunk_size)
+    )
+
+    result = db.execute(stmt)
+    try:
+        for partition in result.partitions():
+            yield [dict(row._mapping) for row in partition]
+    finally:
+        result.close()
+
+
+def _flatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a row to plain text-friendly values (ids and timestamps as strings, actions as JSON)."""
+    flat = dict(row)
+    flat["id"] = str(row["id"])
+    flat["created_at"] = row["created_at"].isoformat() if row["created_at"] else None
+    if row["admin_recommended_actions"] is not None:
+        flat["admin_recommended_actions"] = json.dumps(row["admin_recommended_actions"])
+    return flat
+
+
+def row_to_json(row: Dict[str, Any]) -> str:
+    """Serialize a row as a single JSON line (actions kept as a nested array)."""
+    flat = _flatten(row)
+    flat["admin_recommended_actions"] = row["admin_recommended_actions"]
+    return json.dumps(flat, ensure_ascii=False)
+
+
+def encode_csv(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(_flatten(row) for row in chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def encode_ndjson(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for chunk in chunks:
+        lines = [row_to_json(row) for row in chunk]
+        if lines:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back out on drain()."""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def encode_parquet(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Encode each chunk as one Parquet row group."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("rating", pa.int16()),
+        ("review_text", pa.string()),
+        ("user_response", pa.string()),
+        ("admin_summary", pa.string()),
+        ("admin_recommended_actions", pa.string()),  # JSON
+        ("llm_model", pa.string()),
+        ("prompt_version", pa.string()),
+        ("llm_latency_ms", pa.int64()),
+        ("llm_error", pa.string()),
+    ])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for chunk in chunks:
+            rows = []
+            for row in chunk:
+                flat = _flatten(row)
+                flat["created_at"] = row["created_at"]
+                rows.append(flat)
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+ENCODERS = {
+    "csv": encode_csv,
+    "ndjson": encode_ndjson,
+    "parquet": encode_parquet,
+}
+
+
+def export_submissions(fmt: str, chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Encode row chunks into a stream of bytes in the given format."""
+    check_format(fmt)
+    return ENCODERS[fmt](chunks)
+
+
+def _parse_datetime(value: str) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid ISO datetime: {value}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export submissions to CSV, NDJSON or Parquet.")
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv")
+    parser.add_argument("--output", required=True, help="output file path, or - for stdout")
+    parser.add_argument("--min-rating", type=int)
+    parser.add_argument("--max-rating", type=int)
+    parser.add_argument("--start-date", type=_parse_datetime)
+    parser.add_argument("--end-date", type=_parse_datetime)
+    parser.add_argument("--since", type=_parse_datetime, help="only rows created after this watermark")
+    parser.add_argument(
+        "--state-file",
+        help="read the previous watermark from this file and store the new one after a successful export",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    try:
+        check_format(args.format)
+    except ValueError as e:
+        parser.error(str(e))
+
+    since = args.since
+    if since is None and args.state_file and os.path.exists(args.state_file):
+        with open(args.state_file) as f:
+            since = _parse_datetime(f.read().strip())
+
+    from database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        watermark = get_watermark(db, since)
+        chunks = iter_submission_chunks(
+            db,
+            min_rating=args.min_rating,
+            max_rating=args.max_rating,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            since=since,
+            watermark=watermark,
+            chunk_size=args.chunk_size,
+        )
+
+        out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+        try:
+            for data in export_submissions(args.format, chunks):
+                out.write(data)
+        finally:
+            if out is not sys.stdout.buffer:
+                out.close()
+    finally:
+        db.close()
+
+    if args.state_file and watermark is not None:
+        with open(args.state_file, "w") as f:
+            f.write(watermark.isoformat())
+
+    print(f"Export complete, watermark: {watermark.isoformat() if watermark else 'none'}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+"""
+Shared rating / date filters for submission queries.
+"""
+from datetime import datetime
+from typing import Optional
+
+from models import Submission
+
+
+def apply_submission_filters(
+    q,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+):
+    """Apply optional rating and created_at bounds to an ORM query or select()."""
+    if min_rating is not None:
+        q = q.filter(Submission.rating >= min_rating)
+    if max_rating is not None:
+        q = q.filter(Submission.rating <= max_rating)
+    if start_date is not None:
+        q = q.filter(Submission.created_at >= start_date)
+    if end_date is not None:
+        q = q.filter(Submission.created_at <= end_date)
+    return q
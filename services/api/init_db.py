@@ -1,14 +1,21 @@
 """
 Database initialization script.
-Run this to create all tables.
+Run this to create all tables and indexes. This is the migration step run
+before the API starts; with MIGRATE_ON_STARTUP=false the API skips it.
 """
 from database import engine, Base
-from models import Submission  # Import all models to register them
+from models import Submission, SubmissionAction  # Import all models to register them
+from search import ensure_search_index
 
 def init_database():
     """Create all database tables."""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
+    # create_all skips indexes added to tables that already exist
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    ensure_search_index(engine)
     print("Database tables created successfully!")
 
 if __name__ == "__main__":
@@ -2,15 +2,15 @@
 LLM Service for generating AI responses.
 Supports OpenAI, Gemini, and OpenRouter.
 """
-import os
 import json
 import time
 import re
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, Tuple
-from dotenv import load_dotenv
 
-load_dotenv()
+import httpx
 
+from config import LLM_API_KEY, LLM_PROVIDER, LLM_MODEL
 from prompts import (
     USER_RESPONSE_PROMPT,
     ADMIN_SUMMARY_PROMPT,
@@ -26,9 +26,15 @@ class LLMService:
     """Service for making LLM API calls."""
 
     def __init__(self):
-        self.api_key = os.getenv("LLM_API_KEY")
-        self.provider = os.getenv("LLM_PROVIDER", "openai").lower()
+        self.api_key = LLM_API_KEY
+        self.provider = LLM_PROVIDER
         self.model = self._get_default_model()
+        # Shared client so connections (and TLS sessions) are reused across requests
+        self.client = httpx.Client(timeout=30.0)
+
+    def close(self) -> None:
+        """Close the underlying HTTP client."""
+        self.client.close()
 
     def _get_default_model(self) -> str:
         """Get the default model based on provider."""
@@ -37,7 +43,7 @@ class LLMService:
             "gemini": "gemini-1.5-flash",
             "openrouter": "openai/gpt-4o-mini",
         }
-        return os.getenv("LLM_MODEL", models.get(self.provider, "gpt-4o-mini"))
+        return LLM_MODEL or models.get(self.provider, "gpt-4o-mini")
 
     def _get_api_url(self) -> str:
         """Get the API URL based on provider."""
@@ -59,8 +65,6 @@ class LLMService:
         start_time = time.time()
 
         try:
-            import httpx
-
             if self.provider == "gemini":
                 return self._call_gemini(prompt, start_time)
             else:
@@ -72,8 +76,6 @@ class LLMService:
 
     def _call_openai_compatible(self, prompt: str, start_time: float) -> Tuple[Optional[str], Optional[str], int]:
         """Call OpenAI or OpenRouter API."""
-        import httpx
-
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
@@ -90,21 +92,18 @@ class LLMService:
             "temperature": 0.7,
         }
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(self._get_api_url(), headers=headers, json=payload)
-            latency_ms = int((time.time() - start_time) * 1000)
+        response = self.client.post(self._get_api_url(), headers=headers, json=payload)
+        latency_ms = int((time.time() - start_time) * 1000)
 
-            if response.status_code != 200:
-                return None, f"API error {response.status_code}: {response.text[:200]}", latency_ms
+        if response.status_code != 200:
+            return None, f"API error {response.status_code}: {response.text[:200]}", latency_ms
 
-            data = response.json()
-            content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
-            return content.strip(), None, latency_ms
+        data = response.json()
+        content = data.get("choices", [{}])[0].get("message", {}).get("content", "")
+        return content.strip(), None, latency_ms
 
     def _call_gemini(self, prompt: str, start_time: float) -> Tuple[Optional[str], Optional[str], int]:
         """Call Google Gemini API."""
-        import httpx
-
         url = f"{self._get_api_url()}?key={self.api_key}"
         payload = {
             "contents": [{"parts": [{"text": prompt}]}],
@@ -114,16 +113,15 @@ class LLMService:
             },
         }
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(url, json=payload)
-            latency_ms = int((time.time() - start_time) * 1000)
+        response = self.client.post(url, json=payload)
+        latency_ms = int((time.time() - start_time) * 1000)
 
-            if response.status_code != 200:
-                return None, f"Gemini API error {response.status_code}: {response.text[:200]}", latency_ms
+        if response.status_code != 200:
+            return None, f"Gemini API error {response.status_code}: {response.text[:200]}", latency_ms
 
-            data = response.json()
-            content = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
-            return content.strip(), None, latency_ms
+        data = response.json()
+        content = data.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
+        return content.strip(), None, latency_ms
 
     def _parse_json_actions(self, text: str) -> Optional[List[Dict[str, str]]]:
         """Parse and validate JSON actions from LLM response."""
@@ -271,5 +269,7 @@ class LLMService:
         }
 
 
-# Singleton instance
-llm_service = LLMService()
+@lru_cache(maxsize=None)
+def get_llm_service() -> LLMService:
+    """Shared LLMService instance, created on first use."""
+    return LLMService()
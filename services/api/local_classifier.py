@@ -0,0 +1,331 @@
+"""
+Local review classifier that answers clear-cut reviews without an LLM call.
+
+A hashing vectorizer (no vocabulary to store) feeds three linear models that
+predict the primary action's owner and priority, and the review sentiment.
+They are trained from stored submissions and their LLM-generated
+`admin_recommended_actions`. When every prediction is above the confidence
+threshold, the outputs are filled from templates instead of calling
+`LLMService`.
+
+Requires scikit-learn (see requirements-ml.txt); without it, or without a
+trained model file, the API simply keeps using the LLM for every review.
+
+Usage:
+    python local_classifier.py train
+    python local_classifier.py report
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter, defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
+
+from config import LOCAL_CLASSIFIER_ENABLED, LOCAL_CLASSIFIER_PATH, LOCAL_CLASSIFIER_THRESHOLD
+from prompts import LOCAL_USER_RESPONSES, LOCAL_ADMIN_SUMMARY
+
+
+MODEL_VERSION = "local-v1"
+HEADS = ("owner", "priority", "sentiment")
+N_FEATURES = 2 ** 18
+REPORT_THRESHOLDS = (0.6, 0.7, 0.8, 0.9, 0.95)
+TRAINING_BATCH_SIZE = 5000
+MIN_TRAINING_ROWS = 50
+
+
+def sentiment_for_rating(rating: int) -> str:
+    if rating >= 4:
+        return "positive"
+    if rating <= 2:
+        return "negative"
+    return "neutral"
+
+
+def _build_vectorizer():
+    from sklearn.feature_extraction.text import HashingVectorizer
+
+    return HashingVectorizer(
+        n_features=N_FEATURES,
+        ngram_range=(1, 2),
+        alternate_sign=False,
+        norm="l2",
+    )
+
+
+def _documents(ratings: List[int], texts: List[str]) -> List[str]:
+    # The rating is injected as a token so the linear models can weigh it with the text
+    return [f"__rating_{rating}__ {text}" for rating, text in zip(ratings, texts)]
+
+
+class LocalReviewClassifier:
+    """Predicts owner/priority/sentiment for reviews and builds template outputs."""
+
+    def __init__(self, models: Dict[str, Any], action_templates: Dict[str, str], metadata: Dict[str, Any]):
+        self.models = models
+        self.action_templates = action_templates
+        self.metadata = metadata
+        self.vectorizer = _build_vectorizer()
+
+    def predict_batch(self, ratings: List[int], texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Predict all heads for a batch of reviews in one vectorized pass.
+        Returns one dict per review: {head: label, "<head>_confidence": p, "confidence": min p}
+        """
+        features = self.vectorizer.transform(_documents(ratings, texts))
+        predictions = [{} for _ in texts]
+        for head in HEADS:
+            model = self.models[head]
+            probabilities = model.predict_proba(features)
+            best = probabilities.argmax(axis=1)
+            for i, prediction in enumerate(predictions):
+                prediction[head] = str(model.classes_[best[i]])
+                prediction[f"{head}_confidence"] = float(probabilities[i, best[i]])
+        for prediction in predictions:
+            prediction["confidence"] = min(prediction[f"{head}_confidence"] for head in HEADS)
+        return predictions
+
+    def generate_all(
+        self, rating: int, review_text: str, threshold: float = LOCAL_CLASSIFIER_THRESHOLD
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Template outputs in the same shape as `LLMService.generate_all`,
+        or None when the prediction is not confident enough.
+        """
+        start_time = time.time()
+        prediction = self.predict_batch([rating], [review_text])[0]
+        if prediction["confidence"] < threshold:
+            return None
+
+        owner, priority, sentiment = prediction["owner"], prediction["priority"], prediction["sentiment"]
+        excerpt = review_text if len(review_text) <= 120 else review_text[:117].rstrip() + "..."
+        action = self.action_templates.get(f"{owner}:{priority}", "Acknowledge review")
+
+        return {
+            "user_response": LOCAL_USER_RESPONSES[sentiment],
+            "admin_summary": LOCAL_ADMIN_SUMMARY.format(
+                sentiment=sentiment.capitalize(), rating=rating, excerpt=excerpt
+            ),
+            "admin_recommended_actions": [{"action": action, "priority": priority, "owner": owner}],
+            "llm_model": "local-classifier",
+            "prompt_version": MODEL_VERSION,
+            "llm_latency_ms": int((time.time() - start_time) * 1000),
+            "llm_error": None,
+        }
+
+    def save(self, path: str) -> None:
+        import joblib
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        joblib.dump(
+            {"models": self.models, "action_templates": self.action_templates, "metadata": self.metadata},
+            path,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "LocalReviewClassifier":
+        import joblib
+
+        data = joblib.load(path)
+        return cls(data["models"], data["action_templates"], data["metadata"])
+
+
+@lru_cache(maxsize=None)
+def get_local_classifier() -> Optional[LocalReviewClassifier]:
+    """
+    Shared classifier instance, or None when disabled, untrained, or when the
+    model can't be loaded (scikit-learn missing, corrupt file, version mismatch).
+    """
+    if not LOCAL_CLASSIFIER_ENABLED or not os.path.exists(LOCAL_CLASSIFIER_PATH):
+        return None
+    try:
+        return LocalReviewClassifier.load(LOCAL_CLASSIFIER_PATH)
+    except ImportError:
+        print("Warning: LOCAL_CLASSIFIER_ENABLED is set but scikit-learn is not installed")
+        return None
+    except Exception as e:
+        print(f"Warning: could not load local classifier from {LOCAL_CLASSIFIER_PATH}, using the LLM: {e}")
+        return None
+
+
+# ============================================================================
+# Training and evaluation
+# ============================================================================
+def load_training_rows(db) -> Tuple[List[int], List[str], Dict[str, List[str]], Dict[str, str]]:
+    """
+    Read labelled examples from stored submissions.
+    Rows without LLM output (errors / fallback actions) are skipped; the
+    first recommended action is the owner/priority label.
+    Returns: (ratings, texts, labels per head, action templates)
+    """
+    from sqlalchemy import select, or_
+    from models import Submission
+
+    ratings, texts = [], []
+    labels = {head: [] for head in HEADS}
+    action_counts = defaultdict(Counter)
+
+    stmt = (
+        select(Submission.rating, Submission.review_text, Submission.admin_recommended_actions)
+        .where(Submission.admin_recommended_actions.isnot(None))
+        .where(Submission.llm_error.is_(None))
+        # Never learn from the classifier's own template outputs
+        .where(or_(Submission.llm_model.is_(None), Submission.llm_model != "local-classifier"))
+        .execution_options(stream_results=True, yield_per=TRAINING_BATCH_SIZE)
+    )
+    for rating, review_text, actions in db.execute(stmt):
+        if not actions or not isinstance(actions[0], dict):
+            continue
+        primary = actions[0]
+        if not primary.get("owner") or not primary.get("priority"):
+            continue
+
+        ratings.append(rating)
+        texts.append(review_text)
+        labels["owner"].append(primary["owner"])
+        labels["priority"].append(primary["priority"])
+        labels["sentiment"].append(sentiment_for_rating(rating))
+        if primary.get("action"):
+            action_counts[f"{primary['owner']}:{primary['priority']}"][primary["action"]] += 1
+
+    templates = {key: counts.most_common(1)[0][0] for key, counts in action_counts.items()}
+    return ratings, texts, labels, templates
+
+
+def _fit_models(features, labels: Dict[str, List[str]]) -> Dict[str, Any]:
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.dummy import DummyClassifier
+
+    models = {}
+    for head in HEADS:
+        # A head with a single class in the data can't be fit by a linear model
+        if len(set(labels[head])) < 2:
+            model = DummyClassifier(strategy="most_frequent")
+        else:
+            model = LogisticRegression(max_iter=1000, C=4.0)
+        models[head] = model.fit(features, labels[head])
+    return models
+
+
+def train(db, holdout: float = 0.2, seed: int = 42) -> Tuple[LocalReviewClassifier, Dict[str, Any]]:
+    """
+    Train on stored submissions, evaluate on a holdout split, then refit on
+    all rows. Returns the classifier and its accuracy/coverage report.
+    """
+    from sklearn.model_selection import train_test_split
+
+    ratings, texts, labels, templates = load_training_rows(db)
+    if len(texts) < MIN_TRAINING_ROWS:
+        raise ValueError(f"Need at least {MIN_TRAINING_ROWS} labelled submissions, found {len(texts)}")
+
+    vectorizer = _build_vectorizer()
+    indices = list(range(len(texts)))
+    train_idx, test_idx = train_test_split(indices, test_size=holdout, random_state=seed)
+
+    def subset(idx):
+        return (
+            vectorizer.transform(_documents([ratings[i] for i in idx], [texts[i] for i in idx])),
+            {head: [labels[head][i] for i in idx] for head in HEADS},
+        )
+
+    train_features, train_labels = subset(train_idx)
+    holdout_classifier = LocalReviewClassifier(_fit_models(train_features, train_labels), templates, {})
+    report = evaluate(
+        holdout_classifier,
+        [ratings[i] for i in test_idx],
+        [texts[i] for i in test_idx],
+        {head: [labels[head][i] for i in test_idx] for head in HEADS},
+    )
+    report.update({"train_rows": len(train_idx), "holdout_rows": len(test_idx)})
+
+    all_features, _ = subset(indices)
+    metadata = {
+        "version": MODEL_VERSION,
+        "trained_at": datetime.utcnow().isoformat(),
+        "rows": len(texts),
+        "report": report,
+    }
+    return LocalReviewClassifier(_fit_models(all_features, labels), templates, metadata), report
+
+
+def evaluate(
+    classifier: LocalReviewClassifier,
+    ratings: List[int],
+    texts: List[str],
+    labels: Dict[str, List[str]],
+    thresholds=REPORT_THRESHOLDS,
+) -> Dict[str, Any]:
+    """
+    Per-head accuracy, plus for each confidence threshold the share of reviews
+    answered locally (coverage) and how often all heads were right on those.
+    """
+    predictions = classifier.predict_batch(ratings, texts)
+    total = len(predictions)
+    correct = [all(p[head] == labels[head][i] for head in HEADS) for i, p in enumerate(predictions)]
+
+    report = {
+        "accuracy": {
+            head: round(sum(p[head] == labels[head][i] for i, p in enumerate(predictions)) / total, 4)
+            for head in HEADS
+        },
+        "thresholds": [],
+    }
+    for threshold in thresholds:
+        covered = [i for i, p in enumerate(predictions) if p["confidence"] >= threshold]
+        report["thresholds"].append({
+            "threshold": threshold,
+            "coverage": round(len(covered) / total, 4),
+            "accuracy": round(sum(correct[i] for i in covered) / len(covered), 4) if covered else None,
+        })
+    return report
+
+
+def _print_report(report: Dict[str, Any]) -> None:
+    print(f"Holdout rows: {report.get('holdout_rows', '-')}  (trained on {report.get('train_rows', '-')})")
+    for head, accuracy in report["accuracy"].items():
+        print(f"  {head:<10} accuracy {accuracy:.1%}")
+    print()
+    print("  threshold  coverage  accuracy (all heads)")
+    for row in report["thresholds"]:
+        accuracy = f"{row['accuracy']:.1%}" if row["accuracy"] is not None else "-"
+        print(f"  {row['threshold']:>9.2f}  {row['coverage']:>8.1%}  {accuracy:>8}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Train and evaluate the local review classifier.")
+    parser.add_argument("command", choices=["train", "report"], help="train a model, or show the saved model's report")
+    parser.add_argument("--path", default=LOCAL_CLASSIFIER_PATH, help="model file")
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraction of rows used for evaluation")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == "report":
+        if not os.path.exists(args.path):
+            parser.error(f"No model at {args.path}, run 'python local_classifier.py train' first")
+        report = LocalReviewClassifier.load(args.path).metadata["report"]
+    else:
+        from database import ReadSessionLocal
+
+        db = ReadSessionLocal()
+        try:
+            print("Training local review classifier...", file=sys.stderr)
+            classifier, report = train(db, holdout=args.holdout)
+        except ValueError as e:
+            parser.error(str(e))
+        finally:
+            db.close()
+        classifier.save(args.path)
+        print(f"Saved model to {args.path}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_report(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,31 +1,70 @@
-from fastapi import FastAPI, Depends, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, HTTPException, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, ValidationError
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from typing import List
+from typing import List, Optional
 from datetime import datetime, timedelta
+from uuid import UUID
 
-from database import get_db, engine, Base
-from models import Submission
+from config import MIGRATE_ON_STARTUP
+from database import get_db, ReadSessionLocal, SessionLocal
+from init_db import init_database
+from llm_service import LLMService, get_llm_service
+from local_classifier import LocalReviewClassifier, get_local_classifier
+from models import Submission, SubmissionAction, SubmissionDailyRollup, ActionDailyRollup
+from actions import build_submission_actions
+from export import EXPORT_FORMATS, check_format, get_watermark, iter_submission_chunks, export_submissions
+from search import search_submissions
+from retention import read_archived_submission
 from schemas import (
     SubmissionCreate,
     SubmissionResponse,
     SubmissionListResponse,
+    SubmissionSearchResult,
+    SubmissionSearchResponse,
     ErrorResponse,
     ErrorDetail,
     AnalyticsResponse,
     RatingCount,
-    DailyVolume
+    DailyVolume,
+    ActionAnalyticsResponse,
+    OwnerCount,
+    PriorityCount,
+    DailyPriorityVolume
 )
 
-# Create tables on startup
-Base.metadata.create_all(bind=engine)
+
+def get_read_db(x_consistency: Optional[str] = Header(None)):
+    """
+    Dependency for read-only endpoints. Routed to a read replica when one is
+    configured; send `X-Consistency: strong` to read from the primary.
+    """
+    db = ReadSessionLocal(x_consistency)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the schema step (unless deferred to `python init_db.py`) and build shared clients."""
+    if MIGRATE_ON_STARTUP:
+        init_database()
+    llm_service = get_llm_service()
+    get_local_classifier()
+    yield
+    llm_service.close()
+
 
 app = FastAPI(
     title="Fynd Review API",
     description="Backend API for the Fynd Review System",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration - allow frontend origins
@@ -68,7 +107,9 @@ async def root():
 )
 async def create_submission(
     submission: SubmissionCreate,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    llm_service: LLMService = Depends(get_llm_service),
+    local_classifier: Optional[LocalReviewClassifier] = Depends(get_local_classifier)
 ):
     """
     Create a new review submission.
@@ -79,14 +120,25 @@ async def create_submission(
     Returns the created submission with AI-generated fields.
     """
     try:
-        # Import LLM service (lazy import to avoid circular deps)
-        from llm_service import llm_service
+        # Clear-cut reviews are answered locally when the classifier is enabled
+        ai_outputs = None
+        if local_classifier is not None:
+            try:
+                ai_outputs = local_classifier.generate_all(
+                    rating=submission.rating,
+                    review_text=submission.review_text
+                )
+            except Exception as e:
+                # A broken model must never cost a submission; the LLM answers instead
+                print(f"Warning: local classifier failed, using the LLM: {e}")
+                ai_outputs = None
         
         # Generate AI outputs
-        ai_outputs = llm_service.generate_all(
-            rating=submission.rating,
-            review_text=submission.review_text
-        )
+        if ai_outputs is None:
+            ai_outputs = llm_service.generate_all(
+                rating=submission.rating,
+                review_text=submission.review_text
+            )
         
         # Create database record with AI outputs
         db_submission = Submission(
@@ -102,6 +154,12 @@ async def create_submission(
         )
         
         db.add(db_submission)
+        db.flush()
+        db.add_all(build_submission_actions(
+            db_submission.id,
+            db_submission.created_at,
+            db_submission.admin_recommended_actions
+        ))
         db.commit()
         db.refresh(db_submission)
         
@@ -130,7 +188,7 @@ async def create_submission(
 )
 async def get_submissions(
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get the most recent submissions.
@@ -170,12 +228,213 @@ async def get_submissions(
         )
 
 
+@app.get(
+    "/v1/submissions/search",
+    response_model=SubmissionSearchResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse}
+    }
+)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    min_rating: Optional[int] = Query(None, ge=1, le=5),
+    max_rating: Optional[int] = Query(None, ge=1, le=5),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Full-text search over review text and admin summaries.
+    
+    - **q**: Search terms; quote phrases, e.g. `refund "delivery late"`
+    - **min_rating** / **max_rating**: Optional rating bounds
+    - **start_date** / **end_date**: Optional created_at bounds
+    - **limit**: Maximum number of results (default: 50)
+    
+    Returns matching submissions ordered by relevance. To keep search fast
+    however common the terms are, only 1000 matches (after filters) are
+    ranked: the most recent ones, or on SQLite, for a wide date range near
+    the start of the history, the oldest ones in that range. Submissions
+    moved to the archive by the retention job are not searched.
+    """
+    if min_rating is not None and max_rating is not None and min_rating > max_rating:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "VALIDATION_ERROR", "message": "min_rating cannot exceed max_rating"}
+        )
+    
+    try:
+        results = search_submissions(
+            db,
+            q,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+        
+        return SubmissionSearchResponse(
+            query=q,
+            submissions=[
+                SubmissionSearchResult(
+                    id=s.id,
+                    rating=s.rating,
+                    review_text=s.review_text,
+                    user_response=s.user_response,
+                    admin_summary=s.admin_summary,
+                    admin_recommended_actions=s.admin_recommended_actions,
+                    created_at=s.created_at,
+                    score=score
+                )
+                for s, score in results
+            ],
+            total=len(results)
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"code": "SERVER_ERROR", "message": str(e)}
+        )
+
+
+@app.get(
+    "/v1/submissions/export",
+    response_class=StreamingResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse}
+    }
+)
+async def export(
+    format: str = "csv",
+    min_rating: Optional[int] = Query(None, ge=1, le=5),
+    max_rating: Optional[int] = Query(None, ge=1, le=5),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    since: Optional[datetime] = None,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream all matching submissions as CSV, NDJSON or Parquet.
+    
+    - **format**: csv (default), ndjson or parquet (needs requirements-export.txt)
+    - **min_rating** / **max_rating**: Optional rating bounds
+    - **start_date** / **end_date**: Optional created_at bounds
+    - **since**: Only export rows created after this watermark
+    
+    The `X-Export-Watermark` response header holds the watermark to pass as
+    `since` on the next incremental export. Submissions moved to the archive
+    by the retention job are not exported.
+    """
+    try:
+        check_format(format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"code": "VALIDATION_ERROR", "message": str(e)}
+        )
+    
+    try:
+        watermark = get_watermark(db, since)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"code": "SERVER_ERROR", "message": str(e)}
+        )
+    
+    def stream():
+        # The request-scoped session is closed before the body is streamed.
+        # Stay on the same database the watermark was read from; replica lag
+        # is covered by the watermark's grace interval, not by this.
+        export_db = SessionLocal(bind=db.get_bind())
+        try:
+            chunks = iter_submission_chunks(
+                export_db,
+                min_rating=min_rating,
+                max_rating=max_rating,
+                start_date=start_date,
+                end_date=end_date,
+                since=since,
+                watermark=watermark
+            )
+            yield from export_submissions(format, chunks)
+        finally:
+            export_db.close()
+    
+    headers = {
+        "Content-Disposition": f'attachment; filename="submissions.{format}"'
+    }
+    if watermark is not None:
+        headers["X-Export-Watermark"] = watermark.isoformat()
+    
+    return StreamingResponse(stream(), media_type=EXPORT_FORMATS[format], headers=headers)
+
+
+@app.get(
+    "/v1/submissions/{submission_id}",
+    response_model=SubmissionResponse,
+    responses={
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse}
+    }
+)
+async def get_submission(
+    submission_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a single submission by id.
+    
+    Submissions moved to the archive by the retention job are read back
+    from their compressed archive file. Always reads from the primary so a
+    submission can be fetched right after it was created.
+    """
+    try:
+        s = db.get(Submission, submission_id)
+        if s is not None:
+            return SubmissionResponse(
+                id=s.id,
+                rating=s.rating,
+                review_text=s.review_text,
+                user_response=s.user_response,
+                admin_summary=s.admin_summary,
+                admin_recommended_actions=s.admin_recommended_actions,
+                created_at=s.created_at
+            )
+        
+        archived = read_archived_submission(db, submission_id)
+        
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=503,
+            detail={"code": "ARCHIVE_UNAVAILABLE", "message": str(e)}
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"code": "SERVER_ERROR", "message": str(e)}
+        )
+    
+    if archived is None:
+        raise HTTPException(
+            status_code=404,
+            detail={"code": "NOT_FOUND", "message": "Submission not found"}
+        )
+    
+    return SubmissionResponse(**archived)
+
+
 @app.get(
     "/v1/analytics",
     response_model=AnalyticsResponse,
     responses={500: {"model": ErrorResponse}}
 )
-async def get_analytics(db: Session = Depends(get_db)):
+async def get_analytics(db: Session = Depends(get_read_db)):
     """
     Get analytics data for admin dashboard.
     
@@ -187,19 +446,26 @@ async def get_analytics(db: Session = Depends(get_db)):
     - Today and this week counts
     """
     try:
-        # Total submissions
-        total = db.query(func.count(Submission.id)).scalar() or 0
-        
-        # Rating distribution
-        rating_counts = (
+        # Rating distribution, including rollups of archived submissions
+        rating_counts = dict(
             db.query(Submission.rating, func.count(Submission.id))
             .group_by(Submission.rating)
             .all()
         )
+        archived_counts = (
+            db.query(SubmissionDailyRollup.rating, func.sum(SubmissionDailyRollup.count))
+            .group_by(SubmissionDailyRollup.rating)
+            .all()
+        )
+        for rating, count in archived_counts:
+            rating_counts[rating] = rating_counts.get(rating, 0) + int(count or 0)
+        
+        # Total submissions
+        total = sum(rating_counts.values())
         
         rating_distribution = []
         for rating in range(1, 6):
-            count = next((c for r, c in rating_counts if r == rating), 0)
+            count = rating_counts.get(rating, 0)
             percentage = (count / total * 100) if total > 0 else 0.0
             rating_distribution.append(RatingCount(
                 rating=rating,
@@ -208,7 +474,10 @@ async def get_analytics(db: Session = Depends(get_db)):
             ))
         
         # Average rating
-        avg_rating = db.query(func.avg(Submission.rating)).scalar() or 0.0
+        avg_rating = (
+            sum(rating * count for rating, count in rating_counts.items()) / total
+            if total > 0 else 0.0
+        )
         
         # Daily volume for last 7 days
         today = datetime.utcnow().date()
@@ -261,3 +530,94 @@ async def get_analytics(db: Session = Depends(get_db)):
             status_code=500,
             detail={"code": "SERVER_ERROR", "message": str(e)}
         )
+
+
+@app.get(
+    "/v1/analytics/actions",
+    response_model=ActionAnalyticsResponse,
+    responses={500: {"model": ErrorResponse}}
+)
+async def get_action_analytics(
+    days: int = Query(7, ge=1, le=365),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get recommended action counts for the admin dashboard.
+    
+    - **days**: Size of the window ending today (default: 7)
+    
+    Returns:
+    - Total action count in the window
+    - Action counts by owner and by priority
+    - Daily action volume split by priority
+    """
+    try:
+        today = datetime.utcnow().date()
+        first_day = today - timedelta(days=days - 1)
+        window_start = datetime.combine(first_day, datetime.min.time())
+        
+        counts = (
+            db.query(
+                func.date(SubmissionAction.created_at),
+                SubmissionAction.owner,
+                SubmissionAction.priority,
+                func.count(SubmissionAction.id)
+            )
+            .filter(SubmissionAction.created_at >= window_start)
+            .group_by(
+                func.date(SubmissionAction.created_at),
+                SubmissionAction.owner,
+                SubmissionAction.priority
+            )
+            .all()
+        )
+        # Actions of archived submissions only survive as daily rollups
+        counts += (
+            db.query(
+                ActionDailyRollup.day,
+                ActionDailyRollup.owner,
+                ActionDailyRollup.priority,
+                ActionDailyRollup.count
+            )
+            .filter(ActionDailyRollup.day >= first_day)
+            .all()
+        )
+        
+        owner_totals = {owner: 0 for owner in ("support", "ops", "product")}
+        priority_totals = {priority: 0 for priority in ("high", "medium", "low")}
+        daily = {
+            (first_day + timedelta(days=i)).isoformat(): {"high": 0, "medium": 0, "low": 0}
+            for i in range(days)
+        }
+        
+        for day, owner, priority, count in counts:
+            # SQLite returns DATE() as a string, PostgreSQL as a date
+            day = day.isoformat() if hasattr(day, "isoformat") else str(day)
+            owner_totals[owner] = owner_totals.get(owner, 0) + count
+            priority_totals[priority] = priority_totals.get(priority, 0) + count
+            if day in daily and priority in daily[day]:
+                daily[day][priority] += count
+        
+        return ActionAnalyticsResponse(
+            start_date=first_day.isoformat(),
+            end_date=today.isoformat(),
+            total_actions=sum(priority_totals.values()),
+            by_owner=[
+                OwnerCount(owner=owner, count=count)
+                for owner, count in owner_totals.items()
+            ],
+            by_priority=[
+                PriorityCount(priority=priority, count=count)
+                for priority, count in priority_totals.items()
+            ],
+            daily_priority=[
+                DailyPriorityVolume(date=day, **priorities)
+                for day, priorities in daily.items()
+            ]
+        )
+        
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail={"code": "SERVER_ERROR", "message": str(e)}
+        )
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, Text, DateTime, JSON
+from sqlalchemy import Column, String, Integer, BigInteger, Text, Date, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.types import TypeDecorator, CHAR
 from database import Base
 
@@ -44,7 +44,7 @@ class Submission(Base):
     __tablename__ = "submissions"
 
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
-    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, index=True)
     
     # User input
     rating = Column(Integer, nullable=False)
@@ -60,3 +60,63 @@ class Submission(Base):
     prompt_version = Column(String(50), nullable=True)
     llm_latency_ms = Column(Integer, nullable=True)
     llm_error = Column(Text, nullable=True)
+
+
+class SubmissionAction(Base):
+    """Normalized row per recommended action, used for action analytics."""
+    
+    __tablename__ = "submission_actions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    submission_id = Column(
+        GUID(), ForeignKey("submissions.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    # Copied from the parent submission so analytics never need to join
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    
+    action = Column(Text, nullable=False)
+    priority = Column(String(10), nullable=False)
+    owner = Column(String(20), nullable=False)
+
+    __table_args__ = (
+        Index("ix_submission_actions_created_at_owner_priority", "created_at", "owner", "priority"),
+    )
+
+
+# ============================================================================
+# Retention: rollups of archived rows and pointers into archive files
+# ============================================================================
+class SubmissionDailyRollup(Base):
+    """Submission counts per day and rating for rows moved to the archive."""
+    
+    __tablename__ = "submission_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    rating = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ActionDailyRollup(Base):
+    """Recommended action counts per day, owner and priority for archived rows."""
+    
+    __tablename__ = "action_daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    owner = Column(String(20), primary_key=True)
+    priority = Column(String(10), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class ArchivedSubmission(Base):
+    """Location of an archived submission inside a compressed archive file."""
+    
+    __tablename__ = "archived_submissions"
+
+    id = Column(GUID(), primary_key=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    archived_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+    
+    # Each archive batch is a separate gzip member; offset/length locate it
+    archive_file = Column(String(255), nullable=False)
+    archive_offset = Column(BigInteger, nullable=False)
+    archive_length = Column(Integer, nullable=False)
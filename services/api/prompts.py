@@ -79,3 +79,12 @@ FALLBACK_ACTIONS = [
 FALLBACK_USER_RESPONSE = "Thank you for your feedback. Our team will review your comments and get back to you if needed."
 
 FALLBACK_ADMIN_SUMMARY = "Review requires manual analysis - AI processing unavailable."
+
+# Template outputs used when the local classifier answers without an LLM call
+LOCAL_USER_RESPONSES = {
+    "positive": "Thank you so much for your kind words! We're thrilled you had a great experience and look forward to serving you again.",
+    "neutral": "Thank you for your feedback. We'd love to hear what we could do better to make your next experience even better.",
+    "negative": "We're sorry your experience didn't meet expectations. Our support team will look into this and reach out to help resolve it.",
+}
+
+LOCAL_ADMIN_SUMMARY = '{sentiment} {rating}-star review (auto-classified): "{excerpt}"'
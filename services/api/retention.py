@@ -0,0 +1,214 @@
+"""
+Tiered retention: move old submissions out of the hot table.
+
+For every batch of submissions older than the retention age, the job:
+1. folds their counts into the daily rollup tables used by analytics,
+2. appends them as a gzip-compressed NDJSON member to a monthly archive file,
+3. records where each row went and deletes it from the hot tables.
+
+Archived rows stay retrievable by id via `read_archived_submission`, but no
+longer show up in search or export. ARCHIVE_DIR has no default and must be
+persistent storage shared by every API instance; back it up together with
+the database, since `archived_submissions` only points into its files.
+
+Usage:
+    python retention.py --older-than-days 90
+"""
+import os
+import sys
+import gzip
+import json
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import RETENTION_DAYS, ARCHIVE_DIR
+from models import (
+    Submission,
+    SubmissionAction,
+    SubmissionDailyRollup,
+    ActionDailyRollup,
+    ArchivedSubmission,
+)
+from actions import build_submission_actions
+from export import EXPORT_COLUMNS, row_to_json
+
+
+# Dashboards read the last 7 days from the hot table, so never archive those
+MIN_RETENTION_DAYS = 30
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def _archive_file_name(created_at: datetime) -> str:
+    return f"submissions-{created_at:%Y-%m}.ndjson.gz"
+
+
+def _fold_rollups(db: Session, batch: List[Dict[str, Any]]) -> None:
+    """Add the batch's rating and action counts to the daily rollups."""
+    rating_counts = Counter((row["created_at"].date(), row["rating"]) for row in batch)
+    for (day, rating), count in rating_counts.items():
+        rollup = db.get(SubmissionDailyRollup, (day, rating))
+        if rollup is None:
+            db.add(SubmissionDailyRollup(day=day, rating=rating, count=count))
+        else:
+            rollup.count += count
+
+    # Counted from the rows' own JSON, not submission_actions: rows stored
+    # before that table existed may never have been backfilled, and they
+    # can't be once they're archived
+    action_counts = Counter(
+        (action.created_at.date(), action.owner, action.priority)
+        for row in batch
+        for action in build_submission_actions(row["id"], row["created_at"], row["admin_recommended_actions"])
+    )
+    for (day, owner, priority), count in action_counts.items():
+        rollup = db.get(ActionDailyRollup, (day, owner, priority))
+        if rollup is None:
+            db.add(ActionDailyRollup(day=day, owner=owner, priority=priority, count=count))
+        else:
+            rollup.count += count
+
+
+def _write_archive(batch: List[Dict[str, Any]], archive_dir: str) -> List[ArchivedSubmission]:
+    """Append the batch to monthly archive files, one gzip member per file."""
+    by_file: Dict[str, List[Dict[str, Any]]] = {}
+    for row in batch:
+        by_file.setdefault(_archive_file_name(row["created_at"]), []).append(row)
+
+    pointers = []
+    for file_name, rows in by_file.items():
+        data = gzip.compress(
+            ("\n".join(row_to_json(row) for row in rows) + "\n").encode("utf-8")
+        )
+        with open(os.path.join(archive_dir, file_name), "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        pointers.extend(
+            ArchivedSubmission(
+                id=row["id"],
+                created_at=row["created_at"],
+                archive_file=file_name,
+                archive_offset=offset,
+                archive_length=len(data),
+            )
+            for row in rows
+        )
+    return pointers
+
+
+def archive_submissions(
+    db: Session,
+    older_than_days: int = RETENTION_DAYS,
+    archive_dir: Optional[str] = ARCHIVE_DIR,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> int:
+    """
+    Archive submissions older than `older_than_days`.
+    Each batch is committed on its own; the archive file is written before
+    the commit, so a failed batch only leaves an unreferenced gzip member.
+    Returns: number of submissions archived
+    """
+    if older_than_days < MIN_RETENTION_DAYS:
+        raise ValueError(f"Retention must be at least {MIN_RETENTION_DAYS} days")
+    if not archive_dir:
+        raise ValueError("ARCHIVE_DIR is not set; point it at persistent storage shared by all API instances")
+
+    os.makedirs(archive_dir, exist_ok=True)
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    table = Submission.__table__
+    archived = 0
+
+    while True:
+        batch = [
+            dict(row._mapping)
+            for row in db.execute(
+                select(*[table.c[name] for name in EXPORT_COLUMNS])
+                .where(Submission.created_at < cutoff)
+                .order_by(Submission.created_at, Submission.id)
+                .limit(batch_size)
+            )
+        ]
+        if not batch:
+            break
+
+        ids = [row["id"] for row in batch]
+        _fold_rollups(db, batch)
+        db.add_all(_write_archive(batch, archive_dir))
+        db.query(SubmissionAction).filter(SubmissionAction.submission_id.in_(ids)).delete(synchronize_session=False)
+        db.query(Submission).filter(Submission.id.in_(ids)).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+
+        archived += len(batch)
+
+    return archived
+
+
+def read_archived_submission(
+    db: Session, submission_id, archive_dir: Optional[str] = ARCHIVE_DIR
+) -> Optional[Dict[str, Any]]:
+    """
+    Load an archived submission by id, or None if it was never archived.
+    Raises FileNotFoundError if it was archived but its file isn't reachable.
+    """
+    pointer = db.get(ArchivedSubmission, submission_id)
+    if pointer is None:
+        return None
+
+    path = os.path.join(archive_dir, pointer.archive_file) if archive_dir else None
+    if path is None or not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Submission is archived in {pointer.archive_file}, which is not available in ARCHIVE_DIR"
+        )
+
+    with open(path, "rb") as f:
+        f.seek(pointer.archive_offset)
+        data = gzip.decompress(f.read(pointer.archive_length))
+
+    wanted = str(pointer.id)
+    for line in data.decode("utf-8").splitlines():
+        row = json.loads(line)
+        if row["id"] == wanted:
+            return row
+    return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Archive old submissions to compressed cold storage.")
+    parser.add_argument("--older-than-days", type=int, default=RETENTION_DAYS)
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR)
+    parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+    args = parser.parse_args(argv)
+    if not args.archive_dir:
+        parser.error("ARCHIVE_DIR is not set; pass --archive-dir or set it to persistent storage")
+
+    from database import engine, SessionLocal, Base
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        print(f"Archiving submissions older than {args.older_than_days} days to {args.archive_dir}...")
+        archived = archive_submissions(
+            db,
+            older_than_days=args.older_than_days,
+            archive_dir=args.archive_dir,
+            batch_size=args.batch_size,
+        )
+        print(f"Archived {archived} submissions.")
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
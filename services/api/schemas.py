@@ -47,9 +47,21 @@ class SubmissionListResponse(BaseModel):
     total: int
 
 
+class SubmissionSearchResult(SubmissionResponse):
+    """A submission matched by full-text search."""
+    score: float  # Relevance, higher is better
+
+
+class SubmissionSearchResponse(BaseModel):
+    """Response schema for submission search."""
+    query: str
+    submissions: List[SubmissionSearchResult]
+    total: int
+
+
 class ErrorDetail(BaseModel):
     """Error detail schema."""
-    code: str = Field(..., description="Error code: VALIDATION_ERROR, LLM_ERROR, SERVER_ERROR")
+    code: str = Field(..., description="Error code: VALIDATION_ERROR, LLM_ERROR, NOT_FOUND, SERVER_ERROR")
     message: str
 
 
@@ -82,3 +94,36 @@ class AnalyticsResponse(BaseModel):
     daily_volume: List[DailyVolume]  # Last 7 days
     today_count: int
     this_week_count: int
+
+
+# ============================================================================
+# Action Analytics Schemas
+# ============================================================================
+class OwnerCount(BaseModel):
+    """Count of recommended actions per owner."""
+    owner: str
+    count: int
+
+
+class PriorityCount(BaseModel):
+    """Count of recommended actions per priority."""
+    priority: str
+    count: int
+
+
+class DailyPriorityVolume(BaseModel):
+    """Daily recommended action volume split by priority."""
+    date: str  # ISO date string YYYY-MM-DD
+    high: int
+    medium: int
+    low: int
+
+
+class ActionAnalyticsResponse(BaseModel):
+    """Response schema for action analytics endpoint."""
+    start_date: str  # ISO date string YYYY-MM-DD
+    end_date: str
+    total_actions: int
+    by_owner: List[OwnerCount]
+    by_priority: List[PriorityCount]
+    daily_priority: List[DailyPriorityVolume]
@@ -0,0 +1,300 @@
+"""
+Full-text search over review text and AI summaries.
+
+Uses an FTS5 virtual table on SQLite and a generated tsvector column with a
+GIN index on PostgreSQL. Both are kept in sync by the database itself
+(triggers / generated column), so inserts and enrichment updates are indexed
+without any application-side bookkeeping.
+
+Run `python search.py rebuild` to (re)index existing rows.
+"""
+import re
+import sys
+import argparse
+from datetime import datetime
+from typing import Optional, List, Tuple
+
+from sqlalchemy import select, text, func, literal_column
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import table
+
+from models import Submission
+from filters import apply_submission_filters
+
+
+FTS_TABLE = "submissions_fts"
+
+# Column weights: matches in the review itself rank above matches in the summary
+REVIEW_TEXT_WEIGHT = 1.0
+ADMIN_SUMMARY_WEIGHT = 0.5
+
+# Only N matches are scored, so ranking cost stays bounded no matter how
+# common the search terms are. They are the most recent N, except for wide
+# date ranges on SQLite nearer the start of the table (see _plan_fts_walk).
+RANK_CANDIDATES = 1000
+
+# Date ranges with fewer rows than this bound the FTS scan by rowid (SQLite)
+ROWID_BOUND_MAX_ROWS = 50000
+
+SQLITE_SETUP = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        review_text,
+        admin_summary,
+        content='submissions',
+        content_rowid='rowid',
+        tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS submissions_fts_ai AFTER INSERT ON submissions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, review_text, admin_summary)
+        VALUES (new.rowid, new.review_text, new.admin_summary);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS submissions_fts_ad AFTER DELETE ON submissions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, review_text, admin_summary)
+        VALUES ('delete', old.rowid, old.review_text, old.admin_summary);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS submissions_fts_au
+        AFTER UPDATE OF review_text, admin_summary ON submissions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, review_text, admin_summary)
+        VALUES ('delete', old.rowid, old.review_text, old.admin_summary);
+        INSERT INTO {FTS_TABLE}(rowid, review_text, admin_summary)
+        VALUES (new.rowid, new.review_text, new.admin_summary);
+    END""",
+]
+
+# ALTER TABLE takes an ACCESS EXCLUSIVE lock even when the column exists,
+# so it only runs when this check finds the column missing. IF NOT EXISTS
+# stays for workers that pass the check at the same time.
+# Adding the STORED column rewrites the table under that lock once (about
+# 50 s for 1M rows); the index is then built without blocking writes.
+POSTGRES_COLUMN_CHECK = """SELECT 1 FROM information_schema.columns
+    WHERE table_schema = current_schema()
+      AND table_name = 'submissions' AND column_name = 'search_vector'"""
+
+POSTGRES_ADD_COLUMN = """ALTER TABLE submissions ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(review_text, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(admin_summary, '')), 'B')
+    ) STORED"""
+
+POSTGRES_INDEX = "ix_submissions_search_vector"
+
+POSTGRES_INDEX_CHECK = """SELECT i.indisvalid FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = :name AND c.relnamespace = current_schema()::regnamespace"""
+
+POSTGRES_CREATE_INDEX = f"""CREATE INDEX CONCURRENTLY IF NOT EXISTS {POSTGRES_INDEX}
+    ON submissions USING GIN (search_vector)"""
+
+# Quoted phrases or bare words; everything else (FTS5 operators, punctuation) is dropped
+_TOKEN_RE = re.compile(r'"([^"]+)"|(\w+)', re.UNICODE)
+
+
+def _ensure_postgres_search_index(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if conn.execute(text(POSTGRES_COLUMN_CHECK)).first() is None:
+            conn.execute(text(POSTGRES_ADD_COLUMN))
+            # The rewrite leaves no statistics for search_vector; without them
+            # the planner can't tell common terms from rare ones and ranks
+            # every match instead of walking the created_at index
+            conn.execute(text("ANALYZE submissions"))
+
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction, and two of
+    # them on one table deadlock, so only the worker holding the advisory
+    # lock builds it; the others start without waiting
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        valid = conn.execute(text(POSTGRES_INDEX_CHECK), {"name": POSTGRES_INDEX}).scalar()
+        if valid is None:
+            lock = {"name": POSTGRES_INDEX}
+            if conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:name))"), lock).scalar():
+                try:
+                    conn.execute(text(POSTGRES_CREATE_INDEX))
+                finally:
+                    conn.execute(text("SELECT pg_advisory_unlock(hashtext(:name))"), lock)
+        elif not valid:
+            print(
+                f"Warning: index {POSTGRES_INDEX} is not valid (still being built, or an interrupted "
+                f"build); if no build is running, DROP INDEX CONCURRENTLY {POSTGRES_INDEX} and rerun"
+            )
+
+
+def ensure_search_index(engine: Engine) -> None:
+    """Create the search index structures if they don't exist yet."""
+    if engine.dialect.name == "postgresql":
+        _ensure_postgres_search_index(engine)
+        return
+
+    with engine.begin() as conn:
+        created_fts = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        ).first() is None
+        for statement in SQLITE_SETUP:
+            conn.execute(text(statement))
+        # The update/delete triggers assume every row is indexed; a fresh FTS
+        # table on an existing database must be filled before they fire
+        if created_fts:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def rebuild_search_index(engine: Engine) -> None:
+    """
+    Re-index every existing row (e.g. after a bulk import or VACUUM).
+    On PostgreSQL the generated column already covers existing rows, so this
+    only makes sure the column and index exist.
+    """
+    ensure_search_index(engine)
+    if engine.dialect.name != "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def build_fts5_query(query: str) -> str:
+    """
+    Turn free-form user input into a safe FTS5 MATCH expression.
+    Every word / quoted phrase becomes a quoted FTS5 string, ANDed together.
+    """
+    terms = []
+    for phrase, word in _TOKEN_RE.findall(query):
+        term = (phrase or word).replace('"', "").strip()
+        if term:
+            terms.append(f'"{term}"')
+    return " ".join(terms)
+
+
+def _plan_fts_walk(
+    db: Session, start_date: Optional[datetime], end_date: Optional[datetime]
+) -> Optional[Tuple[Optional[Tuple[int, int]], bool]]:
+    """
+    Decide how the SQLite FTS walk covers a created_at range.
+    Returns None if the range is empty, else (rowid bounds or None, descending).
+
+    Narrow ranges (fewer than ROWID_BOUND_MAX_ROWS rows) get exact rowid
+    bounds from the created_at index and are walked newest first. For wide
+    ranges the walk starts from whichever end of the table is closer to the
+    range, so it doesn't skip through every match outside it first; when
+    that is the oldest end, the candidates are the oldest RANK_CANDIDATES
+    matches in the range rather than the most recent. The filters are still
+    applied on created_at, so this only picks which candidates get ranked,
+    never which rows match.
+    """
+    rowid = literal_column("submissions.rowid")
+    in_range = apply_submission_filters(
+        select(rowid.label("rowid")).select_from(Submission.__table__),
+        start_date=start_date,
+        end_date=end_date,
+    ).limit(ROWID_BOUND_MAX_ROWS).subquery()
+    rows, lowest, highest = db.query(
+        func.count(), func.min(in_range.c.rowid), func.max(in_range.c.rowid)
+    ).one()
+    if rows == 0:
+        return None
+    if rows < ROWID_BOUND_MAX_ROWS:
+        return (lowest, highest), True
+
+    # Approximate positions of the range edges, from single index seeks
+    # (separate queries: SQLite only optimizes a lone min() / max() to a seek)
+    first_rowid = db.query(func.min(rowid)).select_from(Submission).scalar()
+    last_rowid = db.query(func.max(rowid)).select_from(Submission).scalar()
+    start_rowid = first_rowid
+    if start_date is not None:
+        start_rowid = db.query(rowid).filter(Submission.created_at >= start_date).order_by(
+            Submission.created_at.asc()
+        ).limit(1).scalar()
+    end_rowid = last_rowid
+    if end_date is not None:
+        end_rowid = db.query(rowid).filter(Submission.created_at <= end_date).order_by(
+            Submission.created_at.desc()
+        ).limit(1).scalar()
+    return None, (last_rowid - end_rowid) <= (start_rowid - first_rowid)
+
+
+def search_submissions(
+    db: Session,
+    query: str,
+    min_rating: Optional[int] = None,
+    max_rating: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    limit: int = 50,
+) -> List[Tuple[Submission, float]]:
+    """
+    Search submissions by review text and admin summary.
+    Only RANK_CANDIDATES matches (after filters) are scored, and the best
+    `limit` of them returned. They are the most recent matches, except on
+    SQLite for wide date ranges closer to the start of the table, where they
+    are the oldest matches in the range (see `_plan_fts_walk`).
+    Returns: list of (submission, score) ordered by relevance, higher score first.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        search_vector = literal_column("submissions.search_vector")
+        ts_query = func.websearch_to_tsquery("english", query)
+        candidates = (
+            select(Submission.id.label("id"), func.ts_rank_cd(search_vector, ts_query).label("score"))
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(Submission.created_at.desc())
+        )
+        submission_key = Submission.id
+    else:
+        match = build_fts5_query(query)
+        if not match:
+            return []
+        fts_rowid = literal_column(f"{FTS_TABLE}.rowid")
+        bm25 = literal_column(
+            f"bm25({FTS_TABLE}, {REVIEW_TEXT_WEIGHT}, {ADMIN_SUMMARY_WEIGHT})"
+        )
+        # FTS5 walks matches in descending rowid (insertion) order, so bm25 is
+        # only evaluated for the rows that make it under the LIMIT
+        candidates = (
+            select(fts_rowid.label("id"), (-bm25).label("score"))
+            .select_from(
+                table(FTS_TABLE).join(
+                    Submission.__table__, literal_column("submissions.rowid") == fts_rowid
+                )
+            )
+            .where(literal_column(FTS_TABLE).op("MATCH")(match))
+            .order_by(fts_rowid.desc())
+        )
+        if start_date is not None or end_date is not None:
+            plan = _plan_fts_walk(db, start_date, end_date)
+            if plan is None:
+                return []
+            bounds, descending = plan
+            if bounds is not None:
+                candidates = candidates.where(fts_rowid.between(*bounds))
+            if not descending:
+                candidates = candidates.order_by(None).order_by(fts_rowid.asc())
+        submission_key = literal_column("submissions.rowid")
+
+    candidates = apply_submission_filters(candidates, min_rating, max_rating, start_date, end_date)
+    candidates = candidates.limit(RANK_CANDIDATES).subquery()
+
+    q = (
+        db.query(Submission, candidates.c.score)
+        .join(candidates, candidates.c.id == submission_key)
+        .order_by(candidates.c.score.desc())
+        .limit(limit)
+    )
+
+    return [(submission, float(score or 0.0)) for submission, score in q.all()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the submissions full-text search index.")
+    parser.add_argument("command", choices=["create", "rebuild"], help="create the index or re-index all rows")
+    args = parser.parse_args(argv)
+
+    from database import engine
+
+    if args.command == "create":
+        print("Creating search index...")
+        ensure_search_index(engine)
+    else:
+        print("Rebuilding search index...")
+        rebuild_search_index(engine)
+    print("Done!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
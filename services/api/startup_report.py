@@ -0,0 +1,113 @@
+"""
+Startup-time report for the API.
+
+Measures two things in fresh subprocesses:
+- import-time breakdown of `main` (via `python -X importtime`), grouped by top-level package
+- time from launching uvicorn until `/health` first answers 200
+
+Usage:
+    python startup_report.py
+    python startup_report.py --json >> startup_metrics.ndjson
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from collections import defaultdict
+from typing import Optional, List, Dict, Any
+
+import httpx
+
+
+def measure_imports(module: str = "main") -> Dict[str, Any]:
+    """Import `module` in a fresh interpreter and return per-package import times (ms)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    by_package: Dict[str, int] = defaultdict(int)
+    total_us = 0
+    for line in result.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        by_package[name.split(".")[0]] += int(self_us)
+        if name == module:
+            total_us = int(cumulative_us)
+
+    return {
+        "total_ms": round(total_us / 1000, 1),
+        "packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+        },
+    }
+
+
+def measure_time_to_healthy(port: int, timeout: float = 30.0) -> float:
+    """Start uvicorn and return milliseconds until GET /health returns 200."""
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - start < timeout:
+                if process.poll() is not None:
+                    raise RuntimeError("uvicorn exited before becoming healthy")
+                try:
+                    if client.get(url).status_code == 200:
+                        return round((time.perf_counter() - start) * 1000, 1)
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.01)
+        raise RuntimeError(f"/health not ready after {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report API import time and time to first healthy /health.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--top", type=int, default=15, help="number of packages to show")
+    parser.add_argument("--json", action="store_true", help="print a single JSON line instead of a table")
+    args = parser.parse_args(argv)
+
+    imports = measure_imports()
+    healthy_ms = measure_time_to_healthy(args.port, args.timeout)
+
+    if args.json:
+        print(json.dumps({
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "import_main_ms": imports["total_ms"],
+            "time_to_healthy_ms": healthy_ms,
+            "imports_ms": dict(list(imports["packages_ms"].items())[:args.top]),
+        }))
+        return 0
+
+    print(f"import main:          {imports['total_ms']:>8.1f} ms")
+    print(f"time to healthy:      {healthy_ms:>8.1f} ms")
+    print()
+    print("Import time by package (self time):")
+    for name, ms in list(imports["packages_ms"].items())[:args.top]:
+        print(f"  {name:<30} {ms:>8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())